@@ -1,52 +1,104 @@
 #!/usr/bin/env python3
-import argparse, os, re, sys, csv, json
+import argparse, os, re, sys, csv, json, mmap
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-REC_RE = re.compile(r"topic=(\S+).*?seq=(\d+).*?latency_ms=([-]?\d+).*?pub_ts_ms=(\d+).*?recv_ts_ms=(\d+)")
-# Only count true publish lines (must contain [publish] tag)
-PUB_RE = re.compile(r"\[publish\].*?topic=(\S+).*?seq=(\d+).*?pub_ts_ms=(\d+)")
+try:
+    import numpy as np
+except ImportError:  # optional: stats fall back to pure Python
+    np = None
 
-def parse_recvs(path):
-    out = []
+try:
+    import yaml
     try:
-        with open(path, 'r', errors='ignore') as f:
-            for line in f:
-                m = REC_RE.search(line)
-                if not m:
-                    continue
-                topic = m.group(1)
-                seq = int(m.group(2))
-                lat = int(m.group(3))
-                pub_ts = int(m.group(4))
-                recv_ts = int(m.group(5))
-                out.append((topic, seq, lat, pub_ts, recv_ts))
-    except FileNotFoundError:
-        pass
-    return out
+        from yaml import CSafeLoader as YamlLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader as YamlLoader
+except ImportError:  # optional: configs fall back to parse_yaml_minimal
+    yaml = None
+
+def skip_to(key):
+    # "[^\n]*?key", made atomic where re supports it (Python 3.11+): once the first key
+    # on the line is found the engine never backtracks into the skip to look for a later one
+    if sys.version_info >= (3, 11):
+        return rb"(?>[^\n]*?" + key + rb")"
+    return rb"[^\n]*?" + key
+
+# Receive lines carry latency_ms/recv_ts_ms; publish lines must contain the [publish] tag.
+# Both record types are matched by one alternation, applied to one line at a time. With
+# atomic skips, a near-miss line (e.g. missing recv_ts_ms) fails in linear time instead
+# of retrying every earlier split point of each lazy segment.
+LINE_RE = re.compile(
+    rb"(?:\[publish\]" + skip_to(b"topic=") + rb"(?P<ptopic>\S+)"
+    + skip_to(b"seq=") + rb"(?P<pseq>\d+)"
+    + skip_to(b"pub_ts_ms=") + rb"(?P<pts>\d+))"
+    rb"|(?:topic=(?P<rtopic>\S+)"
+    + skip_to(b"seq=") + rb"(?P<rseq>\d+)"
+    + skip_to(b"latency_ms=") + rb"(?P<lat>-?\d+)"
+    + skip_to(b"pub_ts_ms=") + rb"(?P<rpts>\d+)"
+    + skip_to(b"recv_ts_ms=") + rb"(?P<rts>\d+))"
+)
+
+# Section headers and key/value lines for parse_yaml_minimal
+YAML_MQTT = re.compile(r'^\s{0,2}mqtt:\s*$')
+YAML_QOS = re.compile(r'^\s{0,2}qos:\s*$')
+YAML_PAYLOAD_BYTES = re.compile(r'^\s{0,2}payload_bytes:\s*$')
+YAML_PUBLISH = re.compile(r'^\s{0,2}publish:\s*$')
+YAML_KV = re.compile(r'^\s{2,}([A-Za-z0-9_]+):\s*(.*)\s*$')
+YAML_TOP = re.compile(r'^([A-Za-z0-9_]+):\s*(.*)\s*$')
+
+# Capture window bounds embedded in --meta
+SINCE_RE = re.compile(r"since=(\d+)")
+UNTIL_RE = re.compile(r"until=(\d+)")
+
+def map_log(f):
+    try:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Empty files and pipes cannot be mapped; read them as a stream
+        return f
 
-def parse_pubs(path):
-    out = []
+def parse_file(path):
+    recvs = []
+    pubs = []
+    search = LINE_RE.search
     try:
-        with open(path, 'r', errors='ignore') as f:
-            for line in f:
-                m = PUB_RE.search(line)
+        with open(path, 'rb') as f:
+            buf = map_log(f)
+            for line in iter(buf.readline, b''):
+                # Cheap substring test first: most non-record lines (stats, debug) carry
+                # topic= too and would otherwise make the regex scan the whole line.
+                if b'latency_ms=' not in line and b'[publish]' not in line:
+                    continue
+                m = search(line)
                 if not m:
                     continue
-                topic = m.group(1)
-                seq = int(m.group(2))
-                pub_ts = int(m.group(3))
-                out.append((topic, seq, pub_ts))
+                ptopic, pseq, pts, rtopic, rseq, lat, rpts, rts = m.groups()
+                if pseq is not None:
+                    pubs.append((ptopic.decode(errors='ignore'), int(pseq), int(pts)))
+                else:
+                    recvs.append((rtopic.decode(errors='ignore'), int(rseq), int(lat), int(rpts), int(rts)))
+            if buf is not f:
+                buf.close()
     except FileNotFoundError:
         pass
-    return out
+    return recvs, pubs
 
 def write_csv(path, rows):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, 'w', newline='') as f:
         w = csv.writer(f)
         w.writerow(['seq','latency_ms','pub_ts_ms','recv_ts_ms'])
-        for r in rows:
-            w.writerow([r[0], r[1], r[2], r[3]])
+        w.writerows(rows)
+
+def write_table(path, header, rows, fmt):
+    # Every table emitted here is numeric, so nothing needs quoting: %-format each
+    # row tuple into one buffer instead of going through csv.writer. Lines end in
+    # \r\n to match csv.writer's default dialect.
+    with open(path, 'w', newline='') as f:
+        f.write(header + '\r\n')
+        f.write(''.join([fmt % r for r in rows]))
 
 def main():
     ap = argparse.ArgumentParser()
@@ -62,20 +114,16 @@ def main():
 
     recvs = []
     pubs = []
-    if args.java:
-        recvs += parse_recvs(args.java)
-        pubs  += parse_pubs(args.java)
-    if args.go:
-        recvs += parse_recvs(args.go)
-        pubs  += parse_pubs(args.go)
-
-    # Group by topic
-    by_topic_recv = {}
-    for topic, seq, lat, pub_ts, recv_ts in recvs:
-        by_topic_recv.setdefault(topic, []).append((seq, lat, pub_ts, recv_ts))
-    by_topic_pub = {}
-    for topic, seq, pub_ts in pubs:
-        by_topic_pub.setdefault(topic, []).append((seq, pub_ts))
+    paths = [p for p in (args.java, args.go) if p]
+    if len(paths) > 1 and (os.cpu_count() or 1) > 1:
+        # Parsing is CPU-bound (regex), so threads would serialize on the GIL
+        with ProcessPoolExecutor(max_workers=len(paths)) as ex:
+            results = list(ex.map(parse_file, paths))
+    else:
+        results = [parse_file(p) for p in paths]
+    for r, p in results:
+        recvs += r
+        pubs  += p
 
     # Map topics to filenames
     topic_map = {
@@ -83,72 +131,98 @@ def main():
         '/driver/ride': 'ride',
         '/driver/location': 'location',
     }
-    for topic in set(list(by_topic_pub.keys()) + list(by_topic_recv.keys())):
+
+    # Group by topic (only topics we report on)
+    by_topic_recv = defaultdict(list)
+    for topic, seq, lat, pub_ts, recv_ts in recvs:
+        if topic in topic_map:
+            by_topic_recv[topic].append((seq, lat, pub_ts, recv_ts))
+    by_topic_pub = defaultdict(list)
+    for topic, seq, pub_ts in pubs:
+        if topic in topic_map:
+            by_topic_pub[topic].append((seq, pub_ts))
+
+    for topic in by_topic_pub.keys() | by_topic_recv.keys():
         rows = by_topic_recv.get(topic, [])
         pub_rows = by_topic_pub.get(topic, [])
         # Deduplicate publishes by seq (take earliest pub_ts)
-        if pub_rows:
+        if pub_rows and np is not None:
+            seq_arr = np.fromiter((s for s, _ in pub_rows), np.int64, len(pub_rows))
+            ts_arr = np.fromiter((t for _, t in pub_rows), np.int64, len(pub_rows))
+            # np.unique returns seqs already sorted; inv maps each publish to its seq slot
+            uniq_seq, inv = np.unique(seq_arr, return_inverse=True)
+            first_ts = np.full(uniq_seq.size, np.iinfo(np.int64).max, np.int64)
+            np.minimum.at(first_ts, inv, ts_arr)
+            pub_rows = list(zip(uniq_seq.tolist(), first_ts.tolist()))
+        elif pub_rows:
             uniq = {}
             for seq, ts in pub_rows:
                 if (seq not in uniq) or ts < uniq[seq]:
                     uniq[seq] = ts
             pub_rows = [(s, uniq[s]) for s in sorted(uniq.keys())]
-        key = topic_map.get(topic)
-        if not key:
-            continue
+        key = topic_map[topic]
+        # pub_rows come out of the dedup above already ordered by seq
         rows.sort(key=lambda r: r[0])
-        pub_rows.sort(key=lambda r: r[0])
+        recv_seqs = frozenset(r[0] for r in rows)
         csv_path = os.path.join(args.outdir, f'latency_{key}.csv')
-        with open(csv_path, 'w', newline='') as f:
-            w = csv.writer(f)
-            w.writerow(['seq','latency_ms','pub_ts_ms','recv_ts_ms'])
-            for seq, lat, pub_ts, recv_ts in rows:
-                w.writerow([seq, lat, pub_ts, recv_ts])
+        write_table(csv_path, 'seq,latency_ms,pub_ts_ms,recv_ts_ms', rows, '%d,%d,%d,%d\r\n')
 
         # Missing (published but no receive)
-        recv_set = set([seq for (seq, _, _, _) in rows])
-        missing = [(seq, pub_ts) for (seq, pub_ts) in pub_rows if seq not in recv_set]
+        missing = [(seq, pub_ts) for (seq, pub_ts) in pub_rows if seq not in recv_seqs]
         if missing:
             miss_path = os.path.join(args.outdir, f'latency_{key}_missing.csv')
-            with open(miss_path, 'w', newline='') as f:
-                w = csv.writer(f)
-                w.writerow(['seq','pub_ts_ms'])
-                for seq, pub_ts in missing:
-                    w.writerow([seq, pub_ts])
+            write_table(miss_path, 'seq,pub_ts_ms', missing, '%d,%d\r\n')
 
         # Rates per second: published vs received, and delivered ratio per pub-second
-        per_sec_pub = {}
-        for seq, pub_ts in pub_rows:
-            s = pub_ts // 1000
-            per_sec_pub[s] = per_sec_pub.get(s, 0) + 1
-        per_sec_recv = {}
-        for seq, lat, pub_ts, recv_ts in rows:
-            s = recv_ts // 1000
-            per_sec_recv[s] = per_sec_recv.get(s, 0) + 1
-        # delivered ratio by pub second
-        recv_set_all = set([seq for (seq, _, _, _) in rows])
-        per_sec_delivered = {}
-        for seq, pub_ts in pub_rows:
-            s = pub_ts // 1000
-            d = per_sec_delivered.get(s, [0,0])
-            d[1] += 1  # published
-            if seq in recv_set_all:
-                d[0] += 1  # delivered
-            per_sec_delivered[s] = d
-        # Write combined rate CSV
-        secs = sorted(set(list(per_sec_pub.keys()) + list(per_sec_recv.keys())))
-        rate_path = os.path.join(args.outdir, f'rate_{key}.csv')
-        with open(rate_path, 'w', newline='') as f:
-            w = csv.writer(f)
-            w.writerow(['second_unix','published','received','delivered_ratio'])
+        rate_rows = []
+        if np is not None:
+            pub_sec = np.fromiter((p[1] for p in pub_rows), np.int64, len(pub_rows)) // 1000
+            recv_sec = np.fromiter((r[3] for r in rows), np.int64, len(rows)) // 1000
+            both = np.concatenate((pub_sec, recv_sec))
+            s0 = both.min() if both.size else 0
+            n = int(both.max() - s0) + 1 if both.size else 0
+            per_sec_pub = np.bincount(pub_sec - s0, minlength=n)
+            per_sec_recv = np.bincount(recv_sec - s0, minlength=n)
+            # delivered ratio by pub second
+            pub_seq = np.fromiter((p[0] for p in pub_rows), np.int64, len(pub_rows))
+            recv_seq = np.fromiter((r[0] for r in rows), np.int64, len(rows))
+            delivered_mask = np.isin(pub_seq, recv_seq)
+            per_sec_delivered = np.bincount(pub_sec - s0, weights=delivered_mask, minlength=n)
+            for i in np.flatnonzero(per_sec_pub | per_sec_recv):
+                pubc = int(per_sec_pub[i])
+                ratio = float(per_sec_delivered[i] / pubc) if pubc > 0 else ''
+                rate_rows.append((int(s0 + i), pubc, int(per_sec_recv[i]), ratio))
+        else:
+            per_sec_pub = {}
+            for seq, pub_ts in pub_rows:
+                s = pub_ts // 1000
+                per_sec_pub[s] = per_sec_pub.get(s, 0) + 1
+            per_sec_recv = {}
+            for seq, lat, pub_ts, recv_ts in rows:
+                s = recv_ts // 1000
+                per_sec_recv[s] = per_sec_recv.get(s, 0) + 1
+            # delivered ratio by pub second
+            per_sec_delivered = {}
+            for seq, pub_ts in pub_rows:
+                s = pub_ts // 1000
+                d = per_sec_delivered.get(s, [0,0])
+                d[1] += 1  # published
+                if seq in recv_seqs:
+                    d[0] += 1  # delivered
+                per_sec_delivered[s] = d
+            secs = sorted(per_sec_pub.keys() | per_sec_recv.keys())
             for s in secs:
                 pubc = per_sec_pub.get(s, 0)
                 recvc = per_sec_recv.get(s, 0)
                 dlv = per_sec_delivered.get(s, [0,0])
                 ratio = (dlv[0] / dlv[1]) if dlv[1] > 0 else ''
-                w.writerow([s, pubc, recvc, ratio])
+                rate_rows.append((s, pubc, recvc, ratio))
+        # Write combined rate CSV
+        rate_path = os.path.join(args.outdir, f'rate_{key}.csv')
+        # delivered_ratio is a float, or '' when nothing was published that second
+        write_table(rate_path, 'second_unix,published,received,delivered_ratio', rate_rows, '%d,%d,%d,%s\r\n')
 
-    # Minimal YAML parsing utilities (extract only relevant keys)
+    # Minimal YAML parsing utilities (extract only relevant keys); used when PyYAML is missing
     def parse_yaml_minimal(path):
         cfg = {'mqtt': {}, 'qos': {}, 'payload_bytes': {}, 'publish': {}}
         try:
@@ -157,15 +231,15 @@ def main():
                 for line in f:
                     if line.strip().startswith('#') or not line.strip():
                         continue
-                    if re.match(r'^\s{0,2}mqtt:\s*$', line):
+                    if YAML_MQTT.match(line):
                         sect = 'mqtt'; continue
-                    if re.match(r'^\s{0,2}qos:\s*$', line):
+                    if YAML_QOS.match(line):
                         sect = 'qos'; continue
-                    if re.match(r'^\s{0,2}payload_bytes:\s*$', line):
+                    if YAML_PAYLOAD_BYTES.match(line):
                         sect = 'payload_bytes'; continue
-                    if re.match(r'^\s{0,2}publish:\s*$', line):
+                    if YAML_PUBLISH.match(line):
                         sect = 'publish'; continue
-                    m = re.match(r'^\s{2,}([A-Za-z0-9_]+):\s*(.*)\s*$', line)
+                    m = YAML_KV.match(line)
                     if m and sect:
                         k = m.group(1); v = m.group(2).split('#')[0].strip()
                         if v.startswith('"') and v.endswith('"'):
@@ -179,15 +253,25 @@ def main():
                                 pass
                         cfg[sect][k] = v
                     else:
-                        m2 = re.match(r'^([A-Za-z0-9_]+):\s*(.*)\s*$', line)
+                        m2 = YAML_TOP.match(line)
                         if m2:
                             sect = None
             return cfg
         except Exception:
             return cfg
 
-    client_cfg = parse_yaml_minimal(args.client_config) if args.client_config else {}
-    backend_cfg = parse_yaml_minimal(args.backend_config) if args.backend_config else {}
+    def load_config(path):
+        if yaml is None:
+            return parse_yaml_minimal(path)
+        try:
+            with open(path, 'r', errors='ignore') as f:
+                cfg = yaml.load(f, Loader=YamlLoader)
+        except (OSError, yaml.YAMLError):
+            return {}
+        return cfg if isinstance(cfg, dict) else {}
+
+    client_cfg = load_config(args.client_config) if args.client_config else {}
+    backend_cfg = load_config(args.backend_config) if args.backend_config else {}
 
     # Compute summary stats per topic
     def compute_stats(topic, key):
@@ -196,28 +280,44 @@ def main():
         pub_set = set([seq for (seq, _) in pubs])
         # Delivered within window for messages also published within window
         delivered_set = set([seq for (seq, _, _, _) in rows if seq in pub_set])
-        latencies = [lat for (seq, lat, pub_ts, recv_ts) in rows if lat >= 0]
-        latencies.sort()
-        def q(p):
-            if not latencies:
-                return None
-            k = (len(latencies)-1) * (p/100.0)
-            f = int(k)
-            c = min(f+1, len(latencies)-1)
-            if f == c:
-                return float(latencies[f])
-            d0 = latencies[f] * (c - k)
-            d1 = latencies[c] * (k - f)
-            return float(d0 + d1)
+        if np is not None:
+            lat_arr = np.fromiter((r[1] for r in rows if r[1] >= 0), dtype=np.int64)
+            n = lat_arr.size
+            if n:
+                # One O(n) partition places min, max and the quantile neighbours; same
+                # interpolation as the pure-Python helper below
+                ks = [(n - 1) * (p / 100.0) for p in (50, 95, 99)]
+                fc = [(int(k), min(int(k) + 1, n - 1)) for k in ks]
+                part = np.partition(lat_arr, sorted({0, n - 1, *(i for pair in fc for i in pair)}))
+                p50, p95, p99 = (float(part[f]) if f == c else float(part[f] * (c - k) + part[c] * (k - f))
+                                 for k, (f, c) in zip(ks, fc))
+                min_lat, max_lat, mean_lat = float(part[0]), float(part[-1]), int(lat_arr.sum()) / n
+            else:
+                p50 = p95 = p99 = min_lat = max_lat = mean_lat = None
+        else:
+            latencies = [lat for (seq, lat, pub_ts, recv_ts) in rows if lat >= 0]
+            latencies.sort()
+            def q(p):
+                if not latencies:
+                    return None
+                k = (len(latencies)-1) * (p/100.0)
+                f = int(k)
+                c = min(f+1, len(latencies)-1)
+                if f == c:
+                    return float(latencies[f])
+                d0 = latencies[f] * (c - k)
+                d1 = latencies[c] * (k - f)
+                return float(d0 + d1)
+            p50, p95, p99 = q(50), q(95), q(99)
+            min_lat = float(latencies[0]) if latencies else None
+            max_lat = float(latencies[-1]) if latencies else None
+            mean_lat = (sum(latencies)/len(latencies)) if latencies else None
         delivered_count = len(delivered_set)
         published_count = len(pubs)
         received_count = len(rows)
         # Missing based on window-bounded publishes vs receives
         missing_count = max(0, published_count - delivered_count)
         delivered_ratio = (delivered_count/published_count) if published_count > 0 else None
-        min_lat = float(latencies[0]) if latencies else None
-        max_lat = float(latencies[-1]) if latencies else None
-        mean_lat = (sum(latencies)/len(latencies)) if latencies else None
         tmin = min([ts for (_, ts) in pubs], default=None)
         tmax_recv = max([rt for (_, _, _, rt) in rows], default=None)
         return {
@@ -230,15 +330,15 @@ def main():
             'delivered_ratio': delivered_ratio,
             'latency_ms': {
                 'min': min_lat, 'max': max_lat, 'mean': mean_lat,
-                'p50': q(50), 'p95': q(95), 'p99': q(99)
+                'p50': p50, 'p95': p95, 'p99': p99
             },
             'time': {'first_pub_ts_ms': tmin, 'last_recv_ts_ms': tmax_recv}
         }
 
     # Extract capture window from meta if present
     since_ts = None; until_ts = None
-    m1 = re.search(r"since=(\d+)", args.meta or '')
-    m2 = re.search(r"until=(\d+)", args.meta or '')
+    m1 = SINCE_RE.search(args.meta or '')
+    m2 = UNTIL_RE.search(args.meta or '')
     if m1: since_ts = int(m1.group(1))
     if m2: until_ts = int(m2.group(1))
 
@@ -259,7 +359,7 @@ def main():
         'topics': {}
     }
     for t, key in topic_map.items():
-        if t in set(list(by_topic_pub.keys()) + list(by_topic_recv.keys())):
+        if t in by_topic_pub or t in by_topic_recv:
             st = compute_stats(t, key)
             # Attach publisher config snapshot
             if key == 'location':
@@ -293,163 +393,191 @@ def main():
 
     # Simple HTML page with images (PNG) if present
     if args.html:
-        html = [
-            '<!DOCTYPE html>', '<html><head><meta charset="utf-8">',
-            f'<title>{summary["title"]}</title>',
-            '<style>',
-            ':root{--bg:#0b0f14;--panel:#121821;--muted:#9fb0c5;--text:#e6eef7;--accent:#5eb1ff;--ok:#2ecc71;--warn:#f5b041;--bad:#e74c3c;}',
-            'body{margin:24px;background:var(--bg);color:var(--text);font:14px/1.45 system-ui,Segoe UI,Roboto,Arial,sans-serif;}',
-            'h1{margin:0 0 4px 0;font-size:22px;font-weight:600;}',
-            '.meta{color:var(--muted);margin:0 0 20px 0;}',
-            '.grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(320px,1fr));gap:16px;}',
-            '.card{background:var(--panel);border:1px solid rgba(255,255,255,0.06);box-shadow:0 2px 8px rgba(0,0,0,0.25);border-radius:10px;overflow:hidden;}',
-            '.card h2{margin:0;padding:12px 14px;font-size:16px;font-weight:600;border-bottom:1px solid rgba(255,255,255,0.06);}',
-            '.body{padding:12px 14px;}',
-            'table{width:100%;border-collapse:collapse;margin:6px 0 12px 0;}',
-            'th,td{padding:8px 10px;border-bottom:1px solid rgba(255,255,255,0.06);text-align:left;}',
-            'th{color:var(--muted);font-weight:600;background:rgba(255,255,255,0.02);}',
-            '.chips{display:flex;gap:8px;flex-wrap:wrap;margin:8px 0;}',
-            '.chip{background:rgba(255,255,255,0.06);padding:6px 10px;border-radius:999px;border:1px solid rgba(255,255,255,0.08);}',
-            '.charts{display:grid;grid-template-columns:repeat(auto-fit,minmax(380px,1fr));gap:12px;margin-top:8px;}',
-            'figure{margin:0;}',
-            'figcaption{color:var(--muted);font-size:12px;margin:6px 0 0 0;}',
-            'img{width:100%;height:auto;border:1px solid rgba(255,255,255,0.08);border-radius:8px;background:#0e131a;}',
-            'img.chart{cursor:zoom-in;}',
-            '.note{color:var(--muted);font-size:13px;margin-top:6px;}',
-            '.details{margin-top:10px;}',
-            '.details h3{margin:10px 0 6px 0;font-size:14px;}',
-            '.scroll{overflow-x:auto;}',
-            'table{min-width:520px;}',
-            '/* Lightbox */',
-            '.lightbox{position:fixed;inset:0;display:none;align-items:center;justify-content:center;background:rgba(0,0,0,0.7);z-index:9999;}',
-            '.lightbox.open{display:flex;}',
-            '.lb-inner{max-width:96vw;max-height:92vh;text-align:center;}',
-            '.lb-inner img{max-width:96vw;max-height:85vh;border-radius:10px;box-shadow:0 8px 30px rgba(0,0,0,0.45);}',
-            '.lb-cap{color:#e6eef7;margin-top:8px;font-size:13px;opacity:0.9;}',
-            '</style>',
-            '</head><body>',
-            f'<h1>{summary["title"]}</h1>'
-        ]
-        # Capture window display
-        w = summary['window']
-        if w and (w.get('since_unix') and w.get('until_unix')):
-            html += [f"<div class=\"meta\">Window: {w['since_human']} ({w['since_unix']}) → {w['until_human']} ({w['until_unix']})</div>"]
-            html += [f"<div class=\"meta\">Generated: {summary['generated']['human']} ({summary['generated']['unix']})</div>"]
-        elif summary['meta']:
-            html += [f'<div class="meta">{summary["meta"]}</div>']
-        html += ['<div class="grid">']
-        for key, st in summary['topics'].items():
-            html += [f'<div class="card"><h2>{key}</h2><div class="body">']
-            dr = st['delivered_ratio']
-            lat = st['latency_ms']
-            def fmt(v):
-                return '' if v is None else (str(int(v)) if abs(v-int(v))<1e-9 else f"{v:.1f}")
-            html += [
-                '<div class="chips">',
-                f'<div class="chip">published: <strong>{st["published"]}</strong></div>',
-                f'<div class="chip">received: <strong>{st["received"]}</strong></div>',
-                f'<div class="chip">missing: <strong>{st["missing"]}</strong></div>',
-                f'<div class="chip">delivered ratio: <strong>{"" if dr is None else round(dr,3)}</strong></div>',
-                '</div>',
-                '<div class="scroll">',
-                '<table class="stats"><tr><th>min</th><th>mean</th><th>p50</th><th>p95</th><th>p99</th><th>max</th></tr>',
-                f'<tr><td>{fmt(lat["min"])}</td><td>{fmt(lat["mean"])}</td><td>{fmt(lat["p50"])}</td><td>{fmt(lat["p95"])}</td><td>{fmt(lat["p99"])}</td><td>{fmt(lat["max"])}</td></tr></table>',
-                '</div>'
-            ]
-            imgs = [
-                (f'latency_{key}.png', 'Latency vs Seq', 'For each received message, latency_ms = recv_ts_ms − pub_ts_ms; x-axis is published sequence.'),
-                (f'latency_{key}_with_missing.png', 'Latency + Missing', 'Latency line for received messages; red markers at y=0 denote publishes with no matching receive within the window.'),
-                (f'rate_{key}.png', 'Published vs Received per Second', 'Published counts are grouped by publish second; received counts by receive second. Time on x-axis.'),
-                (f'rate_{key}_ratio.png', 'Delivered Ratio per Pub-Second', 'For each publish second: delivered/published, bounded in [0,1].'),
-            ]
-            have = 0
-            html += ['<div class="charts">']
-            for fn, title, desc in imgs:
-                p = os.path.join(args.outdir, fn)
-                if os.path.exists(p):
-                    have += 1
-                    cap = f"{title} — {desc}"
-                    html += [f'<figure><img class="chart" src="{fn}" alt="{title}" title="{title}" data-caption="{cap}"><figcaption>{cap}</figcaption></figure>']
-            html += ['</div>']
-            if have == 0:
-                html += ['<div class="note">No charts generated. Install gnuplot to render PNGs.</div>']
+        # One directory listing instead of a stat per chart per topic
+        present = {e.name for e in os.scandir(args.outdir)}
+        # Stream the page to disk as it is built rather than holding it in memory
+        with open(os.path.join(args.outdir, 'index.html'), 'w', buffering=1 << 16) as f:
+            def app(s):
+                f.write(s + '\n')
+            def ext(items):
+                f.write('\n'.join(items) + '\n')
+            ext((
+                '<!DOCTYPE html>', '<html><head><meta charset="utf-8">',
+                f'<title>{summary["title"]}</title>',
+                '<style>',
+                ':root{--bg:#0b0f14;--panel:#121821;--muted:#9fb0c5;--text:#e6eef7;--accent:#5eb1ff;--ok:#2ecc71;--warn:#f5b041;--bad:#e74c3c;}',
+                'body{margin:24px;background:var(--bg);color:var(--text);font:14px/1.45 system-ui,Segoe UI,Roboto,Arial,sans-serif;}',
+                'h1{margin:0 0 4px 0;font-size:22px;font-weight:600;}',
+                '.meta{color:var(--muted);margin:0 0 20px 0;}',
+                '.grid{display:grid;grid-template-columns:repeat(auto-fit,minmax(320px,1fr));gap:16px;}',
+                '.card{background:var(--panel);border:1px solid rgba(255,255,255,0.06);box-shadow:0 2px 8px rgba(0,0,0,0.25);border-radius:10px;overflow:hidden;}',
+                '.card h2{margin:0;padding:12px 14px;font-size:16px;font-weight:600;border-bottom:1px solid rgba(255,255,255,0.06);}',
+                '.body{padding:12px 14px;}',
+                'table{width:100%;border-collapse:collapse;margin:6px 0 12px 0;}',
+                'th,td{padding:8px 10px;border-bottom:1px solid rgba(255,255,255,0.06);text-align:left;}',
+                'th{color:var(--muted);font-weight:600;background:rgba(255,255,255,0.02);}',
+                '.chips{display:flex;gap:8px;flex-wrap:wrap;margin:8px 0;}',
+                '.chip{background:rgba(255,255,255,0.06);padding:6px 10px;border-radius:999px;border:1px solid rgba(255,255,255,0.08);}',
+                '.charts{display:grid;grid-template-columns:repeat(auto-fit,minmax(380px,1fr));gap:12px;margin-top:8px;}',
+                'figure{margin:0;}',
+                'figcaption{color:var(--muted);font-size:12px;margin:6px 0 0 0;}',
+                'img{width:100%;height:auto;border:1px solid rgba(255,255,255,0.08);border-radius:8px;background:#0e131a;}',
+                'img.chart{cursor:zoom-in;}',
+                '.note{color:var(--muted);font-size:13px;margin-top:6px;}',
+                '.details{margin-top:10px;}',
+                '.details h3{margin:10px 0 6px 0;font-size:14px;}',
+                '.scroll{overflow-x:auto;}',
+                'table{min-width:520px;}',
+                '/* Lightbox */',
+                '.lightbox{position:fixed;inset:0;display:none;align-items:center;justify-content:center;background:rgba(0,0,0,0.7);z-index:9999;}',
+                '.lightbox.open{display:flex;}',
+                '.lb-inner{max-width:96vw;max-height:92vh;text-align:center;}',
+                '.lb-inner img{max-width:96vw;max-height:85vh;border-radius:10px;box-shadow:0 8px 30px rgba(0,0,0,0.45);}',
+                '.lb-cap{color:#e6eef7;margin-top:8px;font-size:13px;opacity:0.9;}',
+                '</style>',
+                '</head><body>',
+                f'<h1>{summary["title"]}</h1>'
+            ))
+            # Capture window display
+            w = summary['window']
+            if w and (w.get('since_unix') and w.get('until_unix')):
+                app(f"<div class=\"meta\">Window: {w['since_human']} ({w['since_unix']}) → {w['until_human']} ({w['until_unix']})</div>")
+                app(f"<div class=\"meta\">Generated: {summary['generated']['human']} ({summary['generated']['unix']})</div>")
+            elif summary['meta']:
+                app(f'<div class="meta">{summary["meta"]}</div>')
+            app('<div class="grid">')
+            for key, st in summary['topics'].items():
+                app(f'<div class="card"><h2>{key}</h2><div class="body">')
+                dr = st['delivered_ratio']
+                lat = st['latency_ms']
+                def fmt(v):
+                    return '' if v is None else (str(int(v)) if abs(v-int(v))<1e-9 else f"{v:.1f}")
+                ext((
+                    '<div class="chips">',
+                    f'<div class="chip">published: <strong>{st["published"]}</strong></div>',
+                    f'<div class="chip">received: <strong>{st["received"]}</strong></div>',
+                    f'<div class="chip">missing: <strong>{st["missing"]}</strong></div>',
+                    f'<div class="chip">delivered ratio: <strong>{"" if dr is None else round(dr,3)}</strong></div>',
+                    '</div>',
+                    '<div class="scroll">',
+                    '<table class="stats"><tr><th>min</th><th>mean</th><th>p50</th><th>p95</th><th>p99</th><th>max</th></tr>',
+                    f'<tr><td>{fmt(lat["min"])}</td><td>{fmt(lat["mean"])}</td><td>{fmt(lat["p50"])}</td><td>{fmt(lat["p95"])}</td><td>{fmt(lat["p99"])}</td><td>{fmt(lat["max"])}</td></tr></table>',
+                    '</div>'
+                ))
+                imgs = [
+                    (f'latency_{key}.png', 'Latency vs Seq', 'For each received message, latency_ms = recv_ts_ms − pub_ts_ms; x-axis is published sequence.'),
+                    (f'latency_{key}_with_missing.png', 'Latency + Missing', 'Latency line for received messages; red markers at y=0 denote publishes with no matching receive within the window.'),
+                    (f'rate_{key}.png', 'Published vs Received per Second', 'Published counts are grouped by publish second; received counts by receive second. Time on x-axis.'),
+                    (f'rate_{key}_ratio.png', 'Delivered Ratio per Pub-Second', 'For each publish second: delivered/published, bounded in [0,1].'),
+                ]
+                have = 0
+                app('<div class="charts">')
+                for fn, title, desc in imgs:
+                    if fn in present:
+                        have += 1
+                        cap = f"{title} — {desc}"
+                        app(f'<figure><img class="chart" src="{fn}" alt="{title}" title="{title}" data-caption="{cap}"><figcaption>{cap}</figcaption></figure>')
+                app('</div>')
+                if have == 0:
+                    app('<div class="note">No charts generated. Install gnuplot to render PNGs.</div>')
 
-            # Config (bulleted)
-            cfg = st.get('config') or {}
-            html += ['<div class="details">']
-            html += ['<h3>Publisher config</h3>','<ul>']
-            def item(k, v):
-                return f"<li><strong>{k}</strong>: {'' if v is None else v}</li>"
-            html += [
-                item('publisher', cfg.get('publisher')),
-                item('client_id', cfg.get('client_id')),
-                item('host', cfg.get('host')),
-                item('port', cfg.get('port')),
-                item('keepalive_secs', cfg.get('keepalive_secs')),
-                item('clean_session', cfg.get('clean_session')),
-                item('separate_pubsub_connections', cfg.get('separate_pubsub_connections')),
-                item('qos', cfg.get('qos')),
-                item('payload_bytes', cfg.get('payload_bytes')),
-                item('publish_interval_ms', cfg.get('publish_interval_ms')),
-            ]
-            html += ['</ul>']
+                # Config (bulleted)
+                cfg = st.get('config') or {}
+                app('<div class="details">')
+                ext(('<h3>Publisher config</h3>','<ul>'))
+                def item(k, v):
+                    return f"<li><strong>{k}</strong>: {'' if v is None else v}</li>"
+                ext((
+                    item('publisher', cfg.get('publisher')),
+                    item('client_id', cfg.get('client_id')),
+                    item('host', cfg.get('host')),
+                    item('port', cfg.get('port')),
+                    item('keepalive_secs', cfg.get('keepalive_secs')),
+                    item('clean_session', cfg.get('clean_session')),
+                    item('separate_pubsub_connections', cfg.get('separate_pubsub_connections')),
+                    item('qos', cfg.get('qos')),
+                    item('payload_bytes', cfg.get('payload_bytes')),
+                    item('publish_interval_ms', cfg.get('publish_interval_ms')),
+                ))
+                app('</ul>')
 
-            # Details table (time, seq, received?, latency)
-            topic = {'offer':'/driver/offer','ride':'/driver/ride','location':'/driver/location'}[key]
-            rows = by_topic_recv.get(topic, [])
-            pubs = by_topic_pub.get(topic, [])
-            recv_map = { seq:(lat, pub_ts, recv_ts) for (seq, lat, pub_ts, recv_ts) in rows }
-            html += ['<h3>Messages</h3>','<div class="scroll">','<table><tr><th>time</th><th>seq</th><th>received?</th><th>latency_ms</th></tr>']
-            for seq, pub_ts in pubs[:2000]:
-                tstr = datetime.fromtimestamp(pub_ts/1000).strftime('%Y-%m-%d %H:%M:%S')
-                r = recv_map.get(seq)
-                received = 'yes' if r else 'no'
-                lat = (r[0] if r else '')
-                html += [f'<tr><td>{tstr}</td><td>{seq}</td><td>{received}</td><td>{lat}</td></tr>']
-            html += ['</table>','</div>','</div>']
-            html += ['</div></div>']
-        html += ['</div>']
-        # Lightbox overlay and behavior
-        html += [
-            '<div id="lightbox" class="lightbox" aria-modal="true" role="dialog">',
-            '  <div class="lb-inner">',
-            '    <img id="lb-img" alt="chart">',
-            '    <div id="lb-cap" class="lb-cap"></div>',
-            '  </div>',
-            '</div>',
-            '<script>',
-            '  (function(){',
-            '    const lb = document.getElementById("lightbox");',
-            '    const im = document.getElementById("lb-img");',
-            '    const cp = document.getElementById("lb-cap");',
-            '    function open(src, cap){ im.src = src; cp.textContent = cap||""; lb.classList.add("open"); }',
-            '    function close(){ lb.classList.remove("open"); im.src=""; cp.textContent=""; }',
-            '    document.addEventListener("click", function(e){',
-            '      const t = e.target;',
-            '      if (t && t.classList && t.classList.contains("chart")) {',
-            '        open(t.getAttribute("src"), t.getAttribute("data-caption"));',
-            '      } else if (t === lb) {',
-            '        close();',
-            '      }',
-            '    });',
-            '    document.addEventListener("keydown", function(e){ if (e.key === "Escape") close(); });',
-            '  })();',
-            '</script>'
-        ]
-        html += ['</body></html>']
-        with open(os.path.join(args.outdir, 'index.html'), 'w') as f:
-            f.write('\n'.join(html))
+                # Details table (time, seq, received?, latency)
+                topic = {'offer':'/driver/offer','ride':'/driver/ride','location':'/driver/location'}[key]
+                rows = by_topic_recv.get(topic, [])
+                pubs = by_topic_pub.get(topic, [])
+                recv_lat = { seq:lat for (seq, lat, _, _) in rows }
+                # Rows are rendered in the browser from [pub_ts_ms, seq, latency_ms|null]
+                msg_rows = [[pub_ts, seq, recv_lat.get(seq)] for seq, pub_ts in pubs[:2000]]
+                ext((
+                    '<h3>Messages</h3>','<div class="scroll">',
+                    f'<table class="msgs" data-key="{key}"><thead><tr><th>time</th><th>seq</th><th>received?</th><th>latency_ms</th></tr></thead><tbody></tbody></table>',
+                    f'<script>window.__rows_{key} = {json.dumps(msg_rows, separators=(",", ":"))};</script>',
+                    '</div>','</div>'
+                ))
+                app('</div></div>')
+            app('</div>')
+            # Message tables: format time in the generating machine's timezone, like the
+            # Window header above, not the viewer's; one innerHTML per table
+            tz_off = (datetime.fromtimestamp(since_ts) if since_ts else now).astimezone().utcoffset()
+            ext((
+                '<script>',
+                '  (function(){',
+                f'    const tzOffsetMs = {int(tz_off.total_seconds() * 1000)};',
+                '    function pad(n){ return (n < 10 ? "0" : "") + n; }',
+                '    function fmt(ms){',
+                '      const d = new Date(ms + tzOffsetMs);',
+                '      return d.getUTCFullYear() + "-" + pad(d.getUTCMonth()+1) + "-" + pad(d.getUTCDate()) + " " + pad(d.getUTCHours()) + ":" + pad(d.getUTCMinutes()) + ":" + pad(d.getUTCSeconds());',
+                '    }',
+                '    document.querySelectorAll("table.msgs").forEach(function(t){',
+                '      const rows = window["__rows_" + t.dataset.key] || [];',
+                '      const out = new Array(rows.length);',
+                '      for (let i = 0; i < rows.length; i++) {',
+                '        const r = rows[i], got = r[2] !== null;',
+                '        out[i] = "<tr><td>" + fmt(r[0]) + "</td><td>" + r[1] + "</td><td>" + (got ? "yes" : "no") + "</td><td>" + (got ? r[2] : "") + "</td></tr>";',
+                '      }',
+                '      t.tBodies[0].innerHTML = out.join("");',
+                '    });',
+                '  })();',
+                '</script>'
+            ))
+            # Lightbox overlay and behavior
+            ext((
+                '<div id="lightbox" class="lightbox" aria-modal="true" role="dialog">',
+                '  <div class="lb-inner">',
+                '    <img id="lb-img" alt="chart">',
+                '    <div id="lb-cap" class="lb-cap"></div>',
+                '  </div>',
+                '</div>',
+                '<script>',
+                '  (function(){',
+                '    const lb = document.getElementById("lightbox");',
+                '    const im = document.getElementById("lb-img");',
+                '    const cp = document.getElementById("lb-cap");',
+                '    function open(src, cap){ im.src = src; cp.textContent = cap||""; lb.classList.add("open"); }',
+                '    function close(){ lb.classList.remove("open"); im.src=""; cp.textContent=""; }',
+                '    document.addEventListener("click", function(e){',
+                '      const t = e.target;',
+                '      if (t && t.classList && t.classList.contains("chart")) {',
+                '        open(t.getAttribute("src"), t.getAttribute("data-caption"));',
+                '      } else if (t === lb) {',
+                '        close();',
+                '      }',
+                '    });',
+                '    document.addEventListener("keydown", function(e){ if (e.key === "Escape") close(); });',
+                '  })();',
+                '</script>'
+            ))
+            f.write('</body></html>')
 
     # Print outputs
+    present = {e.name for e in os.scandir(args.outdir)}
     for t, key in topic_map.items():
         for name in [f'latency_{key}.csv', f'latency_{key}_missing.csv', f'rate_{key}.csv']:
-            p = os.path.join(args.outdir, name)
-            if os.path.exists(p):
-                print(f"[latency_parse] wrote {p}")
+            if name in present:
+                print(f"[latency_parse] wrote {os.path.join(args.outdir, name)}")
     for name in ['summary.json', 'summary.txt', 'index.html']:
-        p = os.path.join(args.outdir, name)
-        if os.path.exists(p):
-            print(f"[latency_parse] wrote {p}")
+        if name in present:
+            print(f"[latency_parse] wrote {os.path.join(args.outdir, name)}")
 
 if __name__ == '__main__':
     main()